@@ -7,11 +7,13 @@
 """
 # import standard libraries
 import sys
+from functools import lru_cache
 from pathlib import Path
 import dash
-from dash import State, dcc, html, Input, Output, callback_context
+from dash import State, dcc, html, Input, Output, callback_context, ClientsideFunction, Patch
 import dash_bootstrap_components as dbc
 import plotly.graph_objects as go
+import plotly.io as pio
 
 # local import
 ## Add project root to path so 'shared' package is importable
@@ -27,17 +29,63 @@ from shared.utils.visualizations import (
     create_ranking_chart
 )
 
+# Serialize figures in callback responses with the orjson C encoder (native numpy support)
+pio.json.config.default_engine = "orjson"
+
 # Initialize Dash app with Bootstrap theme
 app = dash.Dash(
     __name__, 
     title="Oregon Dark Sky Dashboard - Dash",
     external_stylesheets=[dbc.themes.BOOTSTRAP, dbc.icons.BOOTSTRAP],
-    meta_tags=[{"name": "viewport", "content": "width=device-width, initial-scale=1"}]
+    meta_tags=[{"name": "viewport", "content": "width=device-width, initial-scale=1"}],
+    compress=True # gzip responses (figure JSON) via flask-compress
 )
+# expose the underlying Flask server for WSGI servers such as gunicorn
+server = app.server
 
 # Use data saved in shared directory
 processor = OregonSQMProcessor(data_dir=project_root / "shared/data")
 
+
+@lru_cache(maxsize=None)
+def _load_processed_data(meas_type):
+    """
+    Load processed data for a measurement type once per process.
+    Callers must treat the returned DataFrame as read-only.
+    """
+    meas_type_configs = get_meas_type_config(meas_type)
+    return processor.load_processed_data(
+        data_key=meas_type_configs['data_key'],
+        bar_chart_col=meas_type_configs['bar_chart']['bar_chart_y_col']
+        )
+
+
+@lru_cache(maxsize=None)
+def _load_ranking_data(meas_type):
+    """
+    Ranking columns of the processed data for a measurement type, pre-sorted by its ranking column.
+    create_ranking_chart skips its own sort when given already-sorted data.
+    """
+    meas_type_configs = get_meas_type_config(meas_type)
+    y_col = meas_type_configs['bar_chart']['bar_chart_y_col']
+    # load only the columns create_ranking_chart reads, so the join, dropna and the sort move less data
+    return processor.load_processed_data(
+        data_key=meas_type_configs['data_key'],
+        bar_chart_col=y_col,
+        columns=[y_col, 'site_name', 'color_rgba']
+        ).dropna(subset=[y_col, 'site_name']).sort_values(y_col)
+
+
+def warm_data_cache():
+    """
+    Load processed data for every measurement type up front.
+    Called by dash_app/wsgi.py before gunicorn forks its workers (--preload),
+    so the workers share the parsed DataFrames instead of each loading them.
+    """
+    for meas_type in meas_type_dict:
+        _load_processed_data(meas_type)
+        _load_ranking_data(meas_type)
+
 # here we define the custom CSS styles for various DASH components
 custom_styles = {
     'header': {
@@ -344,7 +392,12 @@ app.layout = dbc.Container(
 ## ---------------- Begin Callbacks ---------------------
 
 # callback to update map zoom and center if map is interacted with or refresh button is clicked
-@app.callback(
+# runs in the browser (see assets/clientside.js) so map pan/zoom never round-trips to the server
+app.clientside_callback(
+    ClientsideFunction(
+        namespace='map_view',
+        function_name='update_zoom_and_center'
+    ),
     Output('map-zoom-store', 'data'),
     Output('map-center-store', 'data'),
     Output('max-zoom-violation-store', 'data'),
@@ -357,58 +410,6 @@ app.layout = dbc.Container(
         State('map-center-store', 'data')
     ]
 )
-def update_zoom_and_center(relayoutData, refresh_click, current_zoom, current_center):
-    """
-    Update map zoom and center based on user interactions or refresh button click.
-    Parameters:
-    - relayoutData: Data from map interactions (zoom/pan)
-    - refresh_click: Number of times refresh button has been clicked, not used directly but triggers reset
-    - current_zoom: Current zoom level stored
-    - current_center: Current center coordinates stored
-    Returns:
-    - Updated zoom level and center coordinates
-    """
-        # initialize callback context to determine which input triggered the callback
-    ctx = callback_context
-    
-    # If no trigger, return current values
-    if not ctx.triggered:
-        return current_zoom, current_center, False
-    
-    # Get the ID of the triggered input
-    trigger_id = ctx.triggered[0]['prop_id'].split('.')[0]
-    
-    # If map was interacted with, update zoom and center accordingly
-    if trigger_id == 'oregon-map' and relayoutData:
-        zoom = current_zoom
-        center = current_center
-
-        if 'mapbox.zoom' in relayoutData and relayoutData['mapbox.zoom'] is not None:
-            zoom = relayoutData['mapbox.zoom']
-        elif 'map.zoom' in relayoutData and relayoutData['map.zoom'] is not None:
-            zoom = relayoutData['map.zoom']
-
-        if 'mapbox.center' in relayoutData and relayoutData['mapbox.center'] is not None:
-            center = [
-                relayoutData['mapbox.center'].get('lat', current_center[0]),
-                relayoutData['mapbox.center'].get('lon', current_center[1])
-            ]
-        elif all(k in relayoutData for k in ['mapbox.center.lat', 'mapbox.center.lon']):
-            center = [relayoutData['mapbox.center.lat'], relayoutData['mapbox.center.lon']]
-        elif 'map.center' in relayoutData and relayoutData['map.center'] is not None:
-            center = [relayoutData['map.center']['lat'], relayoutData['map.center']['lon']]
-        
-        if zoom > 10:
-            return 10, current_center, True
-        else:
-            return zoom, center, False
-    
-    # If refresh button was clicked, reset to default values
-    elif trigger_id == 'refresh-btn':
-        return 5, [44.0, -121.0], False
-
-    # If none of the above, return current values
-    return current_zoom, current_center, False
 
 # callback to update clicked sites based on
 
@@ -474,7 +475,8 @@ def _get_site_info_text(
     """Generate markdown text for the clicked site(s) based on measurement type."""
     site_row = df[df["site_name"].isin(clicked_sites)]
     markdown_text = []
-    for i, row in site_row.iterrows():
+    # convert the selected rows to plain dicts in one pass instead of building a Series per row
+    for row in site_row.to_dict(orient="records"):
         markdown_text.append(html.B("{0}".format(row["site_name"])))
         
         if meas_type in ["", "clear_nights_brightness"]:
@@ -525,7 +527,7 @@ def _get_site_info_text(
                 "Percentage Change in Night Sky Brightness per year: {percent_change:.2f}%".format(
                     percent_change=row['Percent_Change_per_year']
                     ),
-                "Number of Years of Data: {num_years}".format(
+                "Number of Years of Data: {num_years:.1f}".format(
                     num_years=row['Number_of_Years_of_Data']
                     )
             ]: markdown_text.append(html.P(str_, style={"marginBottom": "0px"}))
@@ -549,8 +551,9 @@ def _get_site_info_text(
     return markdown_text    
     
 
+@lru_cache(maxsize=len(meas_type_dict))
 def _get_help_text(meas_type):
-    """Generate help text based on measurement type."""
+    """Generate help text based on measurement type (memoized, it only depends on meas_type)."""
     help_text_str_list = [
         """Click on a 'marker' or a 'bar' to select a SQM site. The site will be highlighted on the graphics below and 
             it's corresponding measurements will be shown. Also, note how the highlighted site ranks compared to other sites.""",
@@ -608,6 +611,125 @@ def _get_help_text(meas_type):
     )
 
 
+@lru_cache(maxsize=32)
+def _build_ranking_figure(meas_type, clicked_sites):
+    """
+    Build the ranking bar chart for a measurement type and selection.
+    Inputs are hashable (clicked_sites is a tuple or None), so repeat clicks
+    are served from the cache. The figure is cached as a plain dict so the
+    cached value can never be mutated through a go.Figure handle.
+    """
+    meas_type_configs = get_meas_type_config(meas_type)
+    fig_bar = create_ranking_chart(
+        sites_df=_load_ranking_data(meas_type),
+        configs=meas_type_configs['bar_chart'],
+        clicked_sites=None if clicked_sites is None else list(clicked_sites)
+    )
+    return fig_bar.to_dict()
+
+
+@lru_cache(maxsize=32)
+def _build_scatter_figure(meas_type, clicked_sites):
+    """
+    Build the scatter plot for a measurement type and selection.
+    Memoized the same way as _build_ranking_figure.
+    """
+    meas_type_configs = get_meas_type_config(meas_type)
+    # Add a vertical line at 21.2 mag/arcsec² for clear nights brightness
+    vline_ = 21.2 if meas_type == "clear_nights_brightness" else None
+    fig_scatter = create_interactive_2d_plot(
+        df=_load_processed_data(meas_type),
+        configs=meas_type_configs['scatter_plot'],
+        clicked_sites=None if clicked_sites is None else list(clicked_sites),
+        vline=vline_
+    )
+    return fig_scatter.to_dict()
+
+
+# initial map view (zoom, center) of the page, also restored by the refresh button
+_DEFAULT_MAP_VIEW = (5, (44.0, -121.0))
+
+
+def _build_map_figure(meas_type, clicked_sites, map_zoom, map_center):
+    """
+    Build the site map for a measurement type, selection and map view.
+    Only the default view is memoized (see _build_default_view_map_figure): after a pan
+    or zoom the view is a pair of continuous floats that is rarely seen again, so caching
+    it would only evict the default-view entries. Other views still reuse the memoized
+    per-location grouping of the map builder.
+    """
+    if (map_zoom, tuple(map_center)) == _DEFAULT_MAP_VIEW:
+        return _build_default_view_map_figure(meas_type, clicked_sites)
+    return _create_map_figure(meas_type, clicked_sites, map_zoom, map_center)
+
+
+@lru_cache(maxsize=32)
+def _build_default_view_map_figure(meas_type, clicked_sites):
+    """
+    Build the site map in the default view for a measurement type and selection.
+    Memoized the same way as _build_ranking_figure.
+    """
+    return _create_map_figure(meas_type, clicked_sites, *_DEFAULT_MAP_VIEW)
+
+
+def _create_map_figure(meas_type, clicked_sites, map_zoom, map_center):
+    """
+    Create the site map figure (as a plain dict) for a measurement type, selection and map view.
+    """
+    meas_type_configs = get_meas_type_config(meas_type)
+    ## Determine color column for map based on measurement type
+    if meas_type in ["clear_nights_brightness", "cloudy_nights_brightness"]:
+        color_col = meas_type_configs['scatter_plot']['scatter_x_col']
+    else:
+        color_col = meas_type_configs['bar_chart']['bar_chart_y_col']
+    # call function to generate `go.Figure` map object
+    cmap = create_oregon_map_plotly(
+        sites_df=_load_processed_data(meas_type),
+        color_col=color_col,
+        zoom=map_zoom,
+        map_center=map_center,
+        highlight_sites=None if clicked_sites is None else list(clicked_sites)
+        )
+    return cmap.to_dict()
+
+
+def _map_selection_patch(cmap):
+    """
+    Partial update for the map figure already shown in the browser when only the
+    site selection changed: ships the marker colors/sizes and the stored map view
+    instead of the whole figure.
+    """
+    patch = Patch()
+    patch['data'][0]['marker']['color'] = cmap['data'][0]['marker']['color']
+    patch['data'][0]['marker']['size'] = cmap['data'][0]['marker']['size']
+    patch['layout']['mapbox']['center'] = cmap['layout']['mapbox']['center']
+    patch['layout']['mapbox']['zoom'] = cmap['layout']['mapbox']['zoom']
+    return patch
+
+
+def _ranking_selection_patch(fig_bar):
+    """
+    Partial update for the ranking chart when only the site selection changed:
+    ships the bar border colors/widths, the only properties the selection affects.
+    """
+    patch = Patch()
+    patch['data'][0]['marker']['line'] = fig_bar['data'][0]['marker']['line']
+    return patch
+
+
+def warm_figure_cache():
+    """
+    Build the figures of the initial view (default map view, no site selected)
+    for every measurement type, so first page loads are served from the caches.
+    Called by dash_app/wsgi.py after warm_data_cache().
+    """
+    for meas_type in meas_type_dict:
+        _build_default_view_map_figure(meas_type, None)
+        _build_ranking_figure(meas_type, None)
+        if meas_type in ["clear_nights_brightness", "cloudy_nights_brightness"]:
+            _build_scatter_figure(meas_type, None)
+
+
 # Callbacks for interactivity (mirroring Streamlit logic)
 @app.callback(
     [
@@ -666,6 +788,10 @@ def update_dashboard(
     
     # Check if refresh button was clicked
     ctx = callback_context
+    # only the clicked sites changed: the map on the page already shows this measurement type
+    selection_only = bool(ctx.triggered) and all(
+        t['prop_id'] == 'clicked-sites-store.data' for t in ctx.triggered
+    )
     if ctx.triggered:
         trigger_id = ctx.triggered[0]['prop_id'].split('.')[0]
         if trigger_id == 'refresh-btn':
@@ -677,11 +803,8 @@ def update_dashboard(
     # data-table based on selected measurement type
     meas_type_configs = get_meas_type_config(meas_type)
     
-    ### Load data processed for the selected measurement type
-    final_data_df = processor.load_processed_data(
-        data_key=meas_type_configs['data_key'],
-        bar_chart_col=meas_type_configs['bar_chart']['bar_chart_y_col']
-        )
+    ### Load data processed for the selected measurement type (cached per process)
+    final_data_df = _load_processed_data(meas_type)
     
     # Generate help text based on measurement type
     help_text = _get_help_text(meas_type=meas_type)
@@ -691,20 +814,15 @@ def update_dashboard(
     map_chart_title = ["SQM measurement site map", html.Br(), meas_type_configs['map_text']]
     ## Text to explain map markers
     map_chart_text = "Note: all locations shown in the map below are approximated for privacy."
-    ## Determine color column for map based on measurement type
-    if meas_type in ["clear_nights_brightness", "cloudy_nights_brightness"]:
-        color_col = meas_type_configs['scatter_plot']['scatter_x_col']
-    else:
-        color_col = meas_type_configs['bar_chart']['bar_chart_y_col']
-
-    # call function to generate `go.Figure` map object
-    cmap = create_oregon_map_plotly(
-        sites_df=final_data_df,
-        color_col=color_col,
-        zoom=map_zoom,
-        map_center=map_center,
-        highlight_sites=clicked_sites
-        )
+    ## Create map figure (memoized per selection in the default map view)
+    cmap = _build_map_figure(
+        meas_type,
+        None if clicked_sites is None else tuple(clicked_sites),
+        map_zoom,
+        tuple(map_center)
+    )
+    if selection_only:
+        cmap = _map_selection_patch(cmap)
     
     # Generate site info text if a site is clicked
     if clicked_sites is None:
@@ -723,12 +841,14 @@ def update_dashboard(
     bar_chart_text = "Note: the x-axis is shown in {0} scale".format(
         meas_type_configs['bar_chart']['bar_chart_yicks']['tickmode']
         )
-    ## Create ranking chart using custom function based on Plotly
-    fig_bar = create_ranking_chart(
-        sites_df=final_data_df,
-        configs=meas_type_configs['bar_chart'],
-        clicked_sites=clicked_sites
-    )    
+    ## Create ranking chart using custom function based on Plotly (memoized per selection)
+    # the ranking highlight only tests membership, so the key is order-independent
+    fig_bar = _build_ranking_figure(
+        meas_type,
+        None if clicked_sites is None else tuple(sorted(clicked_sites))
+    )
+    if selection_only:
+        fig_bar = _ranking_selection_patch(fig_bar)
     
     # Create scatter plot if applicable
     if meas_type in ["clear_nights_brightness", "cloudy_nights_brightness"]:
@@ -738,15 +858,10 @@ def update_dashboard(
         # a style to show the scatter plot div when applicable
         fig_scatter_style = {'display': 'block'}
         
-        # Add a vertical line at 21.2 mag/arcsec² for clear nights brightness
-        vline_ = 21.2 if meas_type == "clear_nights_brightness" else None
-        
-        # Create scatter plot using custom function based on Plotly
-        fig_scatter = create_interactive_2d_plot(
-            df=final_data_df,
-            configs=meas_type_configs['scatter_plot'],
-            clicked_sites=clicked_sites,
-            vline=vline_
+        # Create scatter plot using custom function based on Plotly (memoized per selection)
+        fig_scatter = _build_scatter_figure(
+            meas_type,
+            None if clicked_sites is None else tuple(clicked_sites)
         )
         
     else:
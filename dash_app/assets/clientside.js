@@ -0,0 +1,63 @@
+// dash_app/assets/clientside.js
+// Clientside callbacks for the Dash dashboard.
+// Dash serves every .js file in assets/ automatically, so these functions
+// run in the browser and never round-trip to the Flask server.
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    map_view: {
+        /**
+         * Update map zoom and center based on user interactions or refresh button click.
+         * Mirrors the former server-side `update_zoom_and_center` callback.
+         * Returns [zoom, center, max_zoom_violation].
+         */
+        update_zoom_and_center: function(relayoutData, refreshClick, currentZoom, currentCenter) {
+            // initialize callback context to determine which input triggered the callback
+            const ctx = window.dash_clientside.callback_context;
+
+            // If no trigger, return current values
+            if (!ctx.triggered || ctx.triggered.length === 0) {
+                return [currentZoom, currentCenter, false];
+            }
+
+            // Get the ID of the triggered input
+            const triggerId = ctx.triggered[0].prop_id.split('.')[0];
+
+            // If map was interacted with, update zoom and center accordingly
+            if (triggerId === 'oregon-map' && relayoutData && Object.keys(relayoutData).length > 0) {
+                let zoom = currentZoom;
+                let center = currentCenter;
+
+                if (relayoutData['mapbox.zoom'] != null) {
+                    zoom = relayoutData['mapbox.zoom'];
+                } else if (relayoutData['map.zoom'] != null) {
+                    zoom = relayoutData['map.zoom'];
+                }
+
+                if (relayoutData['mapbox.center'] != null) {
+                    const c = relayoutData['mapbox.center'];
+                    center = [
+                        c.lat !== undefined ? c.lat : currentCenter[0],
+                        c.lon !== undefined ? c.lon : currentCenter[1]
+                    ];
+                } else if ('mapbox.center.lat' in relayoutData && 'mapbox.center.lon' in relayoutData) {
+                    center = [relayoutData['mapbox.center.lat'], relayoutData['mapbox.center.lon']];
+                } else if (relayoutData['map.center'] != null) {
+                    center = [relayoutData['map.center'].lat, relayoutData['map.center'].lon];
+                }
+
+                if (zoom > 10) {
+                    return [10, currentCenter, true];
+                }
+                return [zoom, center, false];
+            }
+
+            // If refresh button was clicked, reset to default values
+            if (triggerId === 'refresh-btn') {
+                return [5, [44.0, -121.0], false];
+            }
+
+            // If none of the above, return current values
+            return [currentZoom, currentCenter, false];
+        }
+    }
+});
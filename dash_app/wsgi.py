@@ -0,0 +1,12 @@
+# dash_app/wsgi.py
+"""
+WSGI entry point for serving the Dash dashboard with gunicorn.
+- Processed data and the initial figures for every question are built here, at import time.
+- Run gunicorn with --preload so this happens once in the master process and
+  the forked workers share the loaded DataFrames (copy-on-write).
+"""
+from dash_app.app import server, warm_data_cache, warm_figure_cache
+
+# Load data and build the initial figures once before gunicorn forks the workers
+warm_data_cache()
+warm_figure_cache()
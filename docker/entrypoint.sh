@@ -0,0 +1,11 @@
+#!/bin/sh
+# Container entrypoint shared by the Dash and Streamlit images.
+# Writes the Feather copies of the raw CSV files (OregonSQMProcessor.prebuild_cache)
+# before starting the app. This runs at container start rather than at build time
+# because docker-compose bind-mounts ./shared over /app/shared, which would hide
+# copies built into the image. Up-to-date copies are kept, and a failed write
+# (e.g. a read-only data directory) only means the app parses the CSV files.
+python -c "from shared.utils.data_processing import OregonSQMProcessor; OregonSQMProcessor().prebuild_cache()" \
+    || echo "Feather prebuild failed; loading raw data from CSV" >&2
+
+exec "$@"
@@ -5,6 +5,9 @@ Defining configuration utilities for measurement types:
 - Supply utility functions to retrieve configuration details for each measurement type.
 """
 
+from collections.abc import Mapping
+from types import MappingProxyType
+
 # Configuration dictionary for scatter plot (common across some measurement types)
 scatter_plot_configs = {
     "scatter_plot_title": "Ranking metric vs Median Night Sky Brightness",
@@ -98,19 +101,38 @@ meas_type_dict = {
     },
 }
 
+def _freeze_config(value):
+    """
+    Return a deeply read-only copy of a configuration value:
+    dicts become MappingProxyType views and lists become tuples, at every level.
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze_config(val) for key, val in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze_config(val) for val in value)
+    return value
+
+# Read-only copies of the per-measurement-type configurations (nested settings included),
+# so callers can share them without defensive copies
+_frozen_meas_type_configs = {
+    meas_type: _freeze_config(configs)
+    for meas_type, configs in meas_type_dict.items()
+}
+
 # Function to get configuration values for a given measurement type
-def get_meas_type_config(meas_type: str) -> dict:
+def get_meas_type_config(meas_type: str) -> Mapping:
     """
     Build configuration values for a given measurement type.
     It leverages the meas_type_dict to extract relevant settings.
     Parameters:
     - meas_type (str): The measurement type key.
     Returns:
-        dict of str : dict: Configuration settings for the specified measurement type.
+        Mapping of str : Mapping: Read-only configuration settings for the specified measurement type
+        (nested mappings are read-only too, and lists are tuples).
     """
-    # Validate measurement type
-    if meas_type not in meas_type_dict:
+    # Validate measurement type and look it up in a single dict access
+    configs = _frozen_meas_type_configs.get(meas_type)
+    if configs is None:
         raise ValueError(f"Invalid measurement type: {meas_type}")
-    # Map to table name
     
-    return meas_type_dict[meas_type]
\ No newline at end of file
+    return configs
\ No newline at end of file
@@ -4,11 +4,63 @@ Core data processing utilities for Oregon SQM Network data.
 """
 
 # import standard libraries
-from platform import processor
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import pandas as pd
 import numpy as np
+import pyarrow as pa
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Iterable, Sequence
+
+# categories of the DarkSkyCertified / DarkSkyQualified status columns
+DARK_SKY_STATUS_CATEGORIES = ['NO', 'YES']
+
+# DarkSky certified sites (built once at import, not on every load_processed_data call)
+DSC_SITES = frozenset([
+    'Hart Mountain',
+    'Sisters East',
+    'Sisters High School',
+    'Oregon Observatory Sunriver',
+    'Prineville Reservoir State Park',
+    'Oregon Caves National Monument',
+    'Antelope',
+    'Cottonwood Canyon State Park'
+])
+
+# CSV files at least this large are parsed with the pyarrow engine
+PYARROW_CSV_MIN_BYTES = 1 << 20
+
+# raw files are loaded on a thread pool only when together at least this large
+# (below it, starting the pool costs more than the parallel parsing saves)
+THREADED_LOAD_MIN_BYTES = 4 << 20
+
+
+@lru_cache(maxsize=4)
+def _shared_raw_data_cache(
+    raw_dir: Path
+) -> tuple[dict, threading.Lock]:
+    """
+    Return the raw DataFrame cache (and the lock guarding it) for a raw data directory.
+    Memoized per directory, so every OregonSQMProcessor reading the same files
+    shares one set of parsed DataFrames by reference. Each entry holds the modification
+    times of its source files, so a file changed on disk is read again on the next load.
+    """
+    return {}, threading.Lock()
+
+
+@lru_cache(maxsize=4)
+def _shared_colormap_lookups(
+    raw_dir: Path
+) -> dict:
+    """
+    Return the cache of sorted colormap bins and RGBA strings for a raw data directory.
+    Memoized per directory like _shared_raw_data_cache, so each colormap is sorted
+    and formatted once per loaded colormap table rather than once per processor.
+    """
+    return {}
 
 
 class OregonSQMProcessor:
@@ -32,6 +84,16 @@ class OregonSQMProcessor:
         self.data_dir = Path(data_dir)
         # Define raw and processed data directories
         self.raw_dir = self.data_dir / "raw"
+        # Sorted bins and RGBA strings per colormap, filled on first use
+        # (shared by every processor reading the same directory)
+        self._colormap_lookups = _shared_colormap_lookups(self.raw_dir.resolve())
+        # Raw DataFrames keyed by dataset name, each read from disk on first use and
+        # again when its file changes (shared by every processor reading the same directory)
+        self._raw_data_cache, self._raw_data_lock = _shared_raw_data_cache(self.raw_dir.resolve())
+        # Geocode table indexed by site name, built on first use
+        # (and rebuilt when the geocode table is reloaded)
+        self._geocode_source = None
+        self._geocode_indexed = None
 
     
     def load_raw_data(
@@ -39,21 +101,80 @@ class OregonSQMProcessor:
     ) -> Dict[str, pd.DataFrame]:
         """
         Load all raw CSV files into DataFrames.
+        The files are read once per data directory and again only when they change on disk;
+        later calls reuse the loaded DataFrames, which callers must treat as read-only.
 
         Returns
         -------
         Dict[str, pd.DataFrame]
             Dictionary of DataFrames keyed by dataset name.
         """
-        # Initialize a dictionary to hold the data
-        data = {}
+        return self._load_selected(self._get_csv_file_map())
+
+
+    def _load_selected(
+        self,
+        keys: Iterable[str]
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Load only the selected raw datasets into DataFrames.
+        Each file is read once per data directory and again only when its modification time
+        changes; later calls reuse the loaded DataFrames, which callers must treat as read-only.
+
+        Parameters
+        ----------
+        keys : Iterable[str]
+            Dataset names (keys of _get_csv_file_map) to load.
+        Returns
+        -------
+        Dict[str, pd.DataFrame]
+            Dictionary of DataFrames keyed by dataset name, in the order of keys.
+        """
+        keys = list(keys)
         # Get mapping of dataset names to CSV file paths
         csv_files = self._get_csv_file_map()
-        # Load each CSV file into a DataFrame
-        for key, filename in csv_files.items():
-            self._load_single_csv(data, key, filename)
+        # the lock makes concurrent first calls (e.g. threaded server) read each file only once
+        with self._raw_data_lock:
+            # (re)load the datasets not cached yet or whose files changed since they were cached
+            mtimes = {key: self._source_mtimes(csv_files[key]) for key in keys}
+            missing = [
+                key for key in keys
+                if key not in self._raw_data_cache or self._raw_data_cache[key][0] != mtimes[key]
+            ]
+            if missing:
+                filenames = [csv_files[key] for key in missing]
+                total_bytes = sum(
+                    (self.raw_dir / filename).stat().st_size
+                    for filename in filenames if (self.raw_dir / filename).exists()
+                )
+                if len(missing) > 1 and total_bytes >= THREADED_LOAD_MIN_BYTES:
+                    # Load large files concurrently (Feather copy if prebuilt, else the CSV);
+                    # the parsers release the GIL, and executor.map keeps the results in order
+                    with ThreadPoolExecutor(max_workers=min(8, len(missing))) as executor:
+                        tables = list(executor.map(self._load_single_table, filenames))
+                else:
+                    tables = [self._load_single_table(filename) for filename in filenames]
+                self._raw_data_cache.update(
+                    (key, (mtimes[key], table)) for key, table in zip(missing, tables)
+                )
         
-        return data
+            # return a new dict so callers can't add or replace datasets in the cache
+            return {key: self._raw_data_cache[key][1] for key in keys}
+
+
+    def _source_mtimes(
+        self,
+        filename: str
+    ) -> tuple[int | None, int | None]:
+        """
+        Return the modification times (ns) of a dataset's CSV file and of its Feather copy,
+        None for a missing file. A cached DataFrame is reused only while these are unchanged.
+        """
+        file_path = self.raw_dir / filename
+        return tuple(
+            path.stat().st_mtime_ns if path.exists() else None
+            for path in (file_path, file_path.with_suffix('.feather'))
+        )
 
     
     def _get_csv_file_map(self) -> Dict[str, str]:
@@ -76,31 +197,125 @@ class OregonSQMProcessor:
         }
 
     
-    def _load_single_csv(
+    def _load_single_table(
         self,
-        data: dict,
-        key: str,
         filename: str
-    ):
+    ) -> pd.DataFrame:
         """
-        Load a single CSV file into the data dictionary, with logging.
+        Load a single dataset.
+        Reads the Feather copy written by prebuild_cache when it is at least as new
+        as the CSV (no text parsing or dtype inference). Otherwise, or if the copy
+        can't be read, parses the CSV itself.
 
         Parameters
         ----------
-        data : dict
-            Dictionary to store loaded DataFrames.
-        key : str
-            Key for the dataset.
         filename : str
             CSV file name.
+        Returns
+        -------
+        pd.DataFrame
+            Loaded DataFrame, empty if the file doesn't exist.
         """
         file_path = self.raw_dir / filename
+        feather_path = file_path.with_suffix('.feather')
+        if feather_path.exists() and (
+            not file_path.exists()
+            or feather_path.stat().st_mtime >= file_path.stat().st_mtime
+        ):
+            # Load the prebuilt Feather file into a DataFrame; an unreadable copy falls back to the CSV
+            try:
+                return pd.read_feather(feather_path)
+            except (OSError, pa.ArrowException):
+                if not file_path.exists():
+                    raise
         if file_path.exists():
-            # Load the CSV file into a DataFrame
-            data[key] = pd.read_csv(file_path)
-        else:
-            # If the file doesn't exist, create an empty DataFrame
-            data[key] = pd.DataFrame()
+            # Load the CSV file into a DataFrame; large files use Arrow's multithreaded parser,
+            # small ones the C parser (faster below ~1 MB). Both return the same numpy dtypes
+            # (checked for every raw file by test_load_raw_data_pyarrow_engine).
+            if file_path.stat().st_size >= PYARROW_CSV_MIN_BYTES:
+                return pd.read_csv(file_path, engine='pyarrow')
+            return pd.read_csv(file_path)
+        # If the file doesn't exist, create an empty DataFrame
+        return pd.DataFrame()
+
+
+    def _write_feather_copy(
+        self,
+        df: pd.DataFrame,
+        feather_path: Path
+    ):
+        """
+        Write a DataFrame as an uncompressed Feather (Arrow IPC) file.
+        Uncompressed because for these small tables decompression costs more than it saves.
+        The file is written under a unique temporary name and then renamed, so concurrent
+        writers and readers never see a partially written file; the temporary file is
+        removed if the write fails.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            DataFrame to write.
+        feather_path : Path
+            Destination path.
+        """
+        fd, tmp_name = tempfile.mkstemp(
+            dir=feather_path.parent, prefix=f"{feather_path.name}.", suffix='.tmp'
+        )
+        os.close(fd)
+        tmp_path = Path(tmp_name)
+        try:
+            df.to_feather(tmp_path, compression='uncompressed')
+            os.replace(tmp_path, feather_path)
+        finally:
+            # no-op after a successful rename
+            tmp_path.unlink(missing_ok=True)
+
+
+    def prebuild_cache(self):
+        """
+        Write a Feather (Arrow IPC) copy next to every raw CSV file, so that later
+        load_raw_data calls read binary columns instead of parsing CSV.
+        Copies at least as new as their CSV are kept, so it is cheap to run on every
+        container start (docker/entrypoint.sh); older copies are rewritten.
+        This is the only place the copies are written; loads never write to the data directory.
+        """
+        for filename in self._get_csv_file_map().values():
+            file_path = self.raw_dir / filename
+            feather_path = file_path.with_suffix('.feather')
+            if file_path.exists() and not (
+                feather_path.exists()
+                and feather_path.stat().st_mtime >= file_path.stat().st_mtime
+            ):
+                self._write_feather_copy(pd.read_csv(file_path), feather_path)
+
+
+    def _precompute_colormap_strings(
+        self,
+        colormap_df: pd.DataFrame,
+        colormap_bin_col: str
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Sort a colormap by its bins and format the RGBA string of each bin once.
+        Parameters
+        ----------
+        colormap_df : pd.DataFrame
+            DataFrame containing color mapping information.
+        colormap_bin_col : str
+            Column in colormap_df that contains the bin boundaries.
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray]
+            Sorted bin boundaries and the aligned array of RGBA color strings.
+        """
+        # sort the colormap by its bins (stable, so rows sharing a bin keep their file order)
+        sorted_colormap = colormap_df.sort_values(colormap_bin_col, kind='stable')
+        bins = sorted_colormap[colormap_bin_col].to_numpy()
+        # format the RGBA color of each colormap row
+        bin_colors = sorted_colormap.apply(
+            lambda x: f"rgba({x['red']}, {x['green']}, {x['blue']}, 1)", axis=1
+        ).to_numpy()
+        
+        return bins, bin_colors
 
 
     def _add_color_map_column(
@@ -109,14 +324,16 @@ class OregonSQMProcessor:
         colormap_df: pd.DataFrame,
         value_col: str,
         colormap_bin_col: str = 'brightness_mag_arcsec2',
-        color_col: str = 'color_rgba'
+        color_col: str = 'color_rgba',
+        colormap_key: str | None = None
     ) -> pd.DataFrame:
         """
         Add a color map column to the DataFrame based on value ranges.
+        The column is added in place, so pass a DataFrame the caller owns.
         Parameters
         ----------
         df : pd.DataFrame
-            DataFrame to which the color column will be added.
+            DataFrame to which the color column will be added (modified in place).
         colormap_df : pd.DataFrame
             DataFrame containing color mapping information.
         value_col : str
@@ -125,44 +342,67 @@ class OregonSQMProcessor:
             Column in colormap_df that contains the bin boundaries, by default 'brightness_mag_arcsec2'.
         color_col : str, optional
             Name of the new color column to be added, by default 'color_rgba'.
+        colormap_key : str, optional
+            Dataset key of the colormap (e.g. 'colormap_clear'). If given, its sorted bins
+            and RGBA strings are computed once per loaded colormap table and reused, by default None.
         Returns
         -------
         pd.DataFrame
-            DataFrame with the new color column added.
-        """
-        # Create a copy of the DataFrame to avoid modifying the original
-        df_with_colors = df.copy()
-
-        # iterate over rows and assign colors based on value ranges 
-        for i, row in df.iterrows():
-            # get the value for the current row
-            value = row[value_col]
-
-            # find the nearest colormap bin above the current value (ceiling lookup)
-            above_bins = colormap_df[colormap_df[colormap_bin_col] > value][colormap_bin_col]
-            if above_bins.empty:
-                # value is at or above the max bin — use the last color
-                site_color_bin = colormap_df[colormap_bin_col].max()
-            else:
-                site_color_bin = above_bins.min()
-
-            # get the corresponding RGBA color from the colormap
-            color = colormap_df[
-                colormap_df[colormap_bin_col] == site_color_bin
-            ].apply(
-                lambda x: f"rgba({x['red']}, {x['green']}, {x['blue']}, 1)", axis=1
-            ).values[0]
-
-            # assign the color to the new column
-            df_with_colors.at[i, color_col] = color
+            The same DataFrame, with the new color column added.
+        """
+        # get the sorted bins and their RGBA strings, precomputed once per colormap
+        if colormap_key is None:
+            bins, bin_colors = self._precompute_colormap_strings(colormap_df, colormap_bin_col)
+        else:
+            # recompute when the colormap table was reloaded (its file changed on disk)
+            cached = self._colormap_lookups.get(colormap_key)
+            if cached is None or cached[0] is not colormap_df:
+                cached = (colormap_df, *self._precompute_colormap_strings(colormap_df, colormap_bin_col))
+                self._colormap_lookups[colormap_key] = cached
+            _, bins, bin_colors = cached
+
+        # find the nearest colormap bin above each value (ceiling lookup) in one vectorized pass
+        bin_idx = np.searchsorted(bins, df[value_col].to_numpy(), side='right')
+        # values at or above the max bin (or missing) use the color of the max bin
+        bin_idx[bin_idx == len(bins)] = np.searchsorted(bins, bins[-1], side='left')
+
+        # assign the colors as a new column in place (no copy of the other columns)
+        df[color_col] = bin_colors[bin_idx]
         
-        return df_with_colors
+        return df
     
     
+    def _downcast_numeric_columns(
+        self,
+        df: pd.DataFrame
+    ) -> pd.DataFrame:
+        """
+        Downcast numeric columns to the smallest dtype that holds them.
+        Measurements carry at most 3 decimals, so float32 is plenty at display precision.
+        Parameters
+        ----------
+        df : pd.DataFrame
+            DataFrame whose numeric columns will be downcast in place.
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame with float columns as float32 and integer columns (e.g. Bortle level) as uint8.
+        """
+        # float64 -> float32 for measurements and coordinates
+        float_cols = df.select_dtypes(include='float').columns
+        df[float_cols] = df[float_cols].apply(pd.to_numeric, downcast='float')
+        # int64 -> smallest unsigned int (left unchanged if a column has negative values)
+        int_cols = df.select_dtypes(include='integer').columns
+        df[int_cols] = df[int_cols].apply(pd.to_numeric, downcast='unsigned')
+
+        return df
+
+
     def load_processed_data(
         self,
         data_key: str,
-        bar_chart_col: str
+        bar_chart_col: str,
+        columns: Sequence[str] | None = None
     ):
         """
         Load and process data for a specific measurement type.
@@ -175,26 +415,14 @@ class OregonSQMProcessor:
             Key for the measurement type (e.g., 'clear_measurements').
         bar_chart_col : str
             Column used for bar chart ranking
+        columns : Sequence[str], optional
+            Columns to return. Derived columns (color_rgba, DarkSky status) and geocode
+            columns that are not requested are not computed. Default is None (all columns).
         Returns
         -------
         pd.DataFrame
             Processed DataFrame ready for dashboard visualization.
         """
-        ## Load all raw data from CSVs using the processor
-        raw_dfs = self.load_raw_data()
-        ## data-frame containing results to show on dash-board
-        data_df = raw_dfs[data_key]
-        ## Load geocode CSV and merge with selected data
-        geocode_df = raw_dfs['geocode'].copy()
-        # Merge geocode data with main data
-        final_data_df = pd.merge(data_df, geocode_df, on="site_name", how="left")
-        
-        # Determine the value column for color mapping
-        if bar_chart_col == 'x_brighter_than_darkest_night_sky':
-            value_col = 'median_brightness_mag_arcsec2'
-        else:
-            value_col = bar_chart_col
-
         # Select the colormap and its bin column based on measurement type
         colormap_config = {
             'clear_measurements':  ('colormap_clear',        'brightness_mag_arcsec2'),
@@ -207,36 +435,72 @@ class OregonSQMProcessor:
             data_key, ('colormap_cloudy', 'brightness_mag_arcsec2')
         )
 
-        # Add color mapping column
-        final_data_df = self._add_color_map_column(
-            df=final_data_df,
-            colormap_df=raw_dfs[colormap_key],
-            value_col=value_col,
-            colormap_bin_col=colormap_bin_col,
+        # Determine which derived columns the caller needs
+        add_colors = columns is None or 'color_rgba' in columns
+        add_status = columns is None or not {'DarkSkyCertified', 'DarkSkyQualified'}.isdisjoint(columns)
+
+        ## Load only the raw tables this measurement type needs
+        raw_dfs = self._load_selected(
+            [data_key, 'geocode', colormap_key] if add_colors else [data_key, 'geocode']
         )
+        ## data-frame containing results to show on dash-board
+        data_df = raw_dfs[data_key]
+        ## Index the geocode table by site name once per loaded geocode table and join it to the selected data
+        # (the join returns a new frame, so the geocode table needs no defensive copy)
+        if self._geocode_source is not raw_dfs['geocode']:
+            self._geocode_indexed = raw_dfs['geocode'].set_index('site_name')
+            self._geocode_source = raw_dfs['geocode']
+        geocode_df = self._geocode_indexed
+        if columns is not None:
+            # join only the requested geocode columns
+            geocode_df = geocode_df[[col for col in geocode_df.columns if col in columns]]
+        # Left-join geocode data onto main data via the site_name index
+        # (same result as a left merge on site_name; the lookup uses the geocode index directly)
+        final_data_df = data_df.join(geocode_df, on="site_name")
+        
+        # Determine the value column for color mapping
+        if bar_chart_col == 'x_brighter_than_darkest_night_sky':
+            value_col = 'median_brightness_mag_arcsec2'
+        else:
+            value_col = bar_chart_col
+
+        # Add color mapping column
+        if add_colors:
+            final_data_df = self._add_color_map_column(
+                df=final_data_df,
+                colormap_df=raw_dfs[colormap_key],
+                value_col=value_col,
+                colormap_bin_col=colormap_bin_col,
+                colormap_key=colormap_key,
+            )
         
         # Assign DarkSkyQualified status
-        if data_key == 'clear_measurements':
+        if data_key == 'clear_measurements' and add_status:
             # Assign DarkSkyCertified status
-            DSC_SITES = [
-                'Hart Mountain',
-                'Sisters East',
-                'Sisters High School',
-                'Oregon Observatory Sunriver',
-                'Prineville Reservoir State Park',
-                'Oregon Caves National Monument',
-                'Antelope',
-                'Cottonwood Canyon State Park'
-            ]
-            final_data_df['DarkSkyCertified'] = 'NO'
-            final_data_df.loc[
-                final_data_df['site_name'].isin(DSC_SITES), 'DarkSkyCertified'
-            ] = 'YES'
+            # YES/NO flags are stored as categoricals: comparisons run on integer codes
+            final_data_df['DarkSkyCertified'] = pd.Categorical(
+                np.where(final_data_df['site_name'].isin(DSC_SITES), 'YES', 'NO'),
+                categories=DARK_SKY_STATUS_CATEGORIES,
+            )
             # Assign DarkSkyQualified status based on median brightness
-            final_data_df['DarkSkyQualified'] = 'NO'
-            final_data_df.loc[
-                final_data_df['median_brightness_mag_arcsec2'] > 21.2, 'DarkSkyQualified'
-            ] = 'YES'
+            final_data_df['DarkSkyQualified'] = pd.Categorical(
+                np.where(final_data_df['median_brightness_mag_arcsec2'].to_numpy() > 21.2, 'YES', 'NO'),
+                categories=DARK_SKY_STATUS_CATEGORIES,
+            )
+        
+        # Keep only the requested columns
+        if columns is not None:
+            final_data_df = final_data_df[list(columns)]
+        
+        # Store site names and colors as categoricals: isin / equality lookups in the apps run on
+        # integer codes and the few distinct color strings are stored once
+        # (converted after the join and DarkSkyCertified lookup, which key on the plain strings)
+        for col in ('site_name', 'color_rgba'):
+            if col in final_data_df.columns:
+                final_data_df[col] = final_data_df[col].astype('category')
+        
+        # Downcast numeric columns last so that color bins and thresholds use full precision
+        final_data_df = self._downcast_numeric_columns(final_data_df)
         
         return final_data_df
     
@@ -9,11 +9,52 @@ Primary functions:
 """
 
 # importing neccessary libraries
+import threading
+import weakref
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import folium
 
 
+# Layout properties shared by every figure of a kind, built once at import.
+# Figures are created with _validate=False, so these are written in Plotly's nested form
+# (title=dict(font=...) rather than title_font=...); go.Figure deep-copies its layout
+# argument, so these dicts are never mutated by a figure.
+_RANKING_LAYOUT = dict(
+	autosize=True,
+	plot_bgcolor="aliceblue",
+	margin=dict(l=0, r=0, t=40, b=0),
+	showlegend=False,
+)
+_RANKING_XAXIS = dict(
+	side="bottom",
+	title=dict(font=dict(size=18)),
+	tickfont=dict(size=20),
+)
+_RANKING_YAXIS = dict(
+	tickfont=dict(size=12),
+	dtick=1,
+)
+_SCATTER_LAYOUT = dict(
+	plot_bgcolor="aliceblue",
+	showlegend=False,
+	margin=dict(l=0, r=0, t=40, b=0),
+	autosize=True,
+	height=300,
+	#width=450,
+)
+_SCATTER_AXIS = dict(
+	tickfont=dict(size=14),
+)
+_MAP_LAYOUT = dict(
+	autosize=True,
+	margin=dict(l=0, r=0, t=0, b=0),
+	height=400,
+	showlegend=False,
+)
+
+
 #### Ranking Chart Visualization ####
 def create_ranking_chart(
 	sites_df: pd.DataFrame,
@@ -45,62 +86,61 @@ def create_ranking_chart(
 	y_tick_text = configs['bar_chart_yicks'].get('ticktext', None)
 	
 	# Drop rows with missing values for the metric or site name
-	chart_data = sites_df.dropna(subset=[y_col, 'site_name']).copy()
+	# (projected to the three columns the chart reads first, so the other columns are not copied)
+	chart_data = sites_df[[y_col, 'site_name', 'color_rgba']].dropna(subset=[y_col, 'site_name'])
 	
-	# Sort data
-	chart_data.sort_values(y_col, ascending=True, inplace=True)
+	# Sort data (processed data already comes sorted by the ranking column)
+	if not chart_data[y_col].is_monotonic_increasing:
+		chart_data = chart_data.sort_values(y_col, ascending=True)
 	
-	# Get bar colors from color_rgba column
-	bar_colors = chart_data['color_rgba'].tolist()
+	# Get bar colors from color_rgba column (one ndarray, shared with the default border colors)
+	bar_colors = chart_data['color_rgba'].to_numpy()
 
 	# when no site is clicked, use the color_rgba for border color and width 1
 	marker_line_color = bar_colors
-	marker_line_width = [1 for _ in chart_data["site_name"]]
+	marker_line_width = 1
 
 	# Create marker styles for the clicked site
 	# if a site is clicked, change its border color to cyan and increase border width to 8
 	if clicked_sites is not None:
-		marker_line_color = [
-			"cyan" if site in clicked_sites else marker_line_color[i] for i, site in enumerate(chart_data["site_name"])
-		]
-		marker_line_width = [
-			8 if site in clicked_sites else marker_line_width[i] for i, site in enumerate(chart_data["site_name"])
-		]
+		clicked_mask = chart_data["site_name"].isin(clicked_sites).to_numpy()
+		marker_line_color = np.where(clicked_mask, "cyan", bar_colors)
+		marker_line_width = np.where(clicked_mask, 8, 1)
 	
+	# Layout from the shared constants plus the config-dependent axis settings
+	# (tick arrays that are not configured are left out, as update_layout would drop None)
+	xaxis = dict(_RANKING_XAXIS, type=y_tick_type)
+	if y_tick_vals is not None:
+		xaxis['tickvals'] = y_tick_vals
+	if y_tick_text is not None:
+		xaxis['ticktext'] = y_tick_text
+	layout = dict(
+		_RANKING_LAYOUT,
+		height=max(400, len(chart_data) * 13),
+		xaxis=xaxis,
+		yaxis=dict(_RANKING_YAXIS, title=dict(text=y_label, font=dict(size=20))),
+	)
+
 	# Create the bar chart figure
+	# the trace and layout are passed as plain dicts with _validate=False: the values come
+	# straight from the DataFrame and the constants above, so skip Plotly's per-property validation
 	fig = go.Figure(
-		data=go.Bar(
-			y=chart_data['site_name'], # names of sites on y-axis
-			x=chart_data[y_col], # metric values on x-axis
+		data=[dict(
+			type='bar',
+			y=chart_data['site_name'].to_numpy(), # names of sites on y-axis
+			x=chart_data[y_col].to_numpy(), # metric values on x-axis
 			orientation='h', # horizontal bars
 			hovertemplate='<b>%{y}</b><br>Value: %{x:.3f}<extra></extra>', # show site name and value on hover
-			marker_color=bar_colors,
-			marker_line_color=marker_line_color,
-			marker_line_width=marker_line_width,
-		)
-	)
-	
-	# Update layout for better appearance
-	fig.update_layout(
-		autosize=True,
-		plot_bgcolor="aliceblue",
-		xaxis_side="bottom",
-		height=max(400, len(chart_data) * 13),
-		margin=dict(l=0, r=0, t=40, b=0),
-		showlegend=False,
-		xaxis=dict(
-			title_font=dict(size=18),
-			tickfont=dict(size=20),
-			type=y_tick_type,
-			tickvals=y_tick_vals,
-			ticktext=y_tick_text,
-		),
-		yaxis=dict(
-			title=y_label,
-			title_font=dict(size=20),
-			tickfont=dict(size=12),
-			dtick=1,
-		)
+			marker=dict(
+				color=bar_colors,
+				line=dict(
+					color=marker_line_color,
+					width=marker_line_width,
+				),
+			),
+		)],
+		layout=layout,
+		_validate=False,
 	)
 
 	return fig
@@ -139,82 +179,149 @@ def create_interactive_2d_plot(
 	x_label = configs.get('scatter_x_label')
 	y_label = configs.get('scatter_y_label')
 
-	# when no site is clicked, use the color_rgba for border color and width 1
-	marker_line_color = df['color_rgba'].tolist()
+	# marker colors from the color_rgba column, also used as border color
+	# (one ndarray shared by both properties instead of a Series plus a Python list copy)
+	marker_colors = df['color_rgba'].to_numpy()
 	
 	# Create the scatter plot figure
-	fig = go.Figure(
-    	data=go.Scatter(
-        	x=df[x_col],
-        	y=df[y_col],
-        	mode='markers',
-        	marker=dict(
-            	color=df['color_rgba'],
-            	size=15,
-				line=dict(
-					color=marker_line_color,
-				)
-        	),
-            hovertext=df['site_name']
-    	)
-		)
+	# plain dict traces of ndarrays with _validate=False, as in create_ranking_chart
+	# (WebGL scatter: highlight re-renders redraw one canvas instead of an SVG node per marker)
+	traces = [dict(
+		type='scattergl',
+		x=df[x_col].to_numpy(),
+		y=df[y_col].to_numpy(),
+		mode='markers',
+		marker=dict(
+			color=marker_colors,
+			size=15,
+			line=dict(
+				color=marker_colors,
+			)
+		),
+		hovertext=df['site_name'].to_numpy()
+	)]
 	
 	# If a site is clicked, add another scatter trace with larger cyan markers
 	if clicked_sites is not None:
 		selected_df = df[df['site_name'].isin(clicked_sites)]
-		fig.add_trace(go.Scatter(
-			x=selected_df[x_col],
-			y=selected_df[y_col],
+		traces.append(dict(
+			type='scattergl',
+			x=selected_df[x_col].to_numpy(),
+			y=selected_df[y_col].to_numpy(),
 			mode='markers',
 			marker=dict(color='cyan', size=20),
-			hovertext=selected_df['site_name'],
+			hovertext=selected_df['site_name'].to_numpy(),
 		))
-
-	# Update layout for better appearance
-	fig.update_layout(
-    	plot_bgcolor="aliceblue",
-  		showlegend=False,
-		margin=dict(l=0, r=0, t=40, b=0),
-		autosize=True,
-		height=300,
-		#width=450,
-		xaxis=dict(
-			title=x_label,
-			title_font=dict(size=18),
-			tickfont=dict(size=14)
-		),
-		yaxis=dict(
-			title=y_label,
-			title_font=dict(size=18),
-			tickfont=dict(size=14)
-		)
+	# Layout from the shared constants plus the configured axis titles
+	layout = dict(
+		_SCATTER_LAYOUT,
+		xaxis=dict(_SCATTER_AXIS, title=dict(text=x_label, font=dict(size=18))),
+		yaxis=dict(_SCATTER_AXIS, title=dict(text=y_label, font=dict(size=18))),
 	)
 
 	# If vline is specified, add a vertical line and annotation
 	if vline:
-		fig.add_shape(
+		# top of the line: one vectorized max instead of two Python-level max() scans
+		y_top = df[y_col].max() + 1
+		layout['shapes'] = [dict(
 			type="line",
 			x0=vline,
 			x1=vline,
 			y0=0,
-			y1=max(df[y_col])+1,
+			y1=y_top,
 			xref="x", yref="y", line=dict(color="black", dash="dash")
-		)
+		)]
 		# Add annotation text at the top of the vline
-		fig.add_annotation(
+		layout['annotations'] = [dict(
 			x=vline,
-			y=max(df[y_col])+1,
+			y=y_top,
 			text="""Dark-Sky Qualified <br> if >= {0} mag/arcsec²""".format(vline),
 			showarrow=False,
 			yshift=0,
 			xshift=-60,
 			font=dict(size=12, color="black"),
 			xanchor="center"
-		)
+		)]
+
+	fig = go.Figure(data=traces, layout=layout, _validate=False)
 	return fig
 
 
 ######## Oregon Map Visualization ########
+# Per-location groupings of recently mapped DataFrames, keyed by (id(sites_df), color_col).
+# Each entry keeps a weak reference to its DataFrame, so an id reused by a new frame
+# after the old one was freed is never matched.
+_GROUPED_SITES_CACHE_SIZE = 8
+_grouped_sites_cache = {}
+_grouped_sites_lock = threading.Lock()
+
+
+def _group_sites_by_location(
+	sites_df: pd.DataFrame,
+	color_col: str,
+) -> tuple[pd.DataFrame, np.ndarray]:
+	"""
+	Group sites sharing the same coordinates into one map marker.
+
+	Memoized per DataFrame object and color column, so map builds for the same (cached)
+	data only pay for the highlight step. The returned frame is shared and must not be modified.
+
+	Parameters
+	----------
+	sites_df : pd.DataFrame
+		DataFrame containing site data.
+	color_col : str
+		Column whose highest value within a location picks that marker's color.
+
+	Returns
+	-------
+	tuple[pd.DataFrame, np.ndarray]
+		One row per location (latitude, longitude, list of site_name, color_rgba), and the
+		position of each sites_df row's location in that frame (-1 for missing coordinates).
+	"""
+	key = (id(sites_df), color_col)
+	with _grouped_sites_lock:
+		cached = _grouped_sites_cache.get(key)
+	if cached is not None and cached[0]() is sites_df:
+		return cached[1], cached[2]
+
+	# Group by latitude and longitude to aggregate site names and get color
+	# (built-in groupby aggregations instead of a per-group Python apply)
+	site_groups = sites_df.groupby(['latitude', 'longitude'])
+	# list of site names at each location
+	grouped = site_groups['site_name'].agg(list).reset_index()
+	# color_rgba from the row with the highest metric in each group (same group order)
+	color_idx = site_groups[color_col].idxmax()
+	grouped['color_rgba'] = sites_df.loc[color_idx.to_numpy(), 'color_rgba'].to_numpy()
+	# location of every site row, numbered in the same (sorted) order as grouped
+	group_ids = site_groups.ngroup().fillna(-1).to_numpy(dtype=np.int64)
+
+	with _grouped_sites_lock:
+		if len(_grouped_sites_cache) >= _GROUPED_SITES_CACHE_SIZE:
+			# drop the oldest entry
+			_grouped_sites_cache.pop(next(iter(_grouped_sites_cache)))
+		_grouped_sites_cache[key] = (weakref.ref(sites_df), grouped, group_ids)
+	return grouped, group_ids
+
+
+def _highlighted_locations(
+	sites_df: pd.DataFrame,
+	group_ids: np.ndarray,
+	n_locations: int,
+	highlight_sites: list | None,
+) -> np.ndarray:
+	"""
+	Boolean mask over the grouped locations: True where any site at the location is in
+	highlight_sites. One isin over all sites, scattered onto the locations by group id.
+	"""
+	masker = np.zeros(n_locations, dtype=bool)
+	# highlight_sites may be a list or a numpy array (Streamlit stores clicked sites as an array)
+	if highlight_sites is not None and len(highlight_sites):
+		hit_ids = group_ids[sites_df['site_name'].isin(highlight_sites).to_numpy()]
+		masker[hit_ids[hit_ids >= 0]] = True
+	return masker
+
+
 def create_oregon_map_plotly(
 	sites_df,
 	map_center=[44.0, -121.0],
@@ -242,68 +349,46 @@ def create_oregon_map_plotly(
 		Plotly Figure object with site markers.
 	"""
 	
-	# Group by lat/lon and aggregate site names
-	def get_color_for_group(group, color_col):
-    	# Get color_rgba from the row with the highest metric
-		idx = group[color_col].idxmax()
-		return group.loc[idx, 'color_rgba']
+	# One marker per location (memoized grouping; the shared frame is not modified here)
+	grouped, group_ids = _group_sites_by_location(sites_df, color_col)
+	# Create a text for hover info by joining site names
+	site_text = [", ".join(x) for x in grouped['site_name']]
 	
-	# Group by latitude and longitude to aggregate site names and get color
-	grouped = sites_df.groupby(
-		['latitude', 'longitude']
-		).apply(
-		lambda g: pd.Series(
-			{
-		'site_name': g['site_name'].tolist(),
-		'color_rgba': get_color_for_group(g, color_col),
-			}
-		),
-		include_groups=False # False to avoid adding group keys to the index
-	).reset_index()
-	# Create a text column for hover info by joining site names
-	grouped['site_text'] = grouped['site_name'].apply(lambda x: ", ".join(x))
-	# Set default marker size
-	grouped['marker_size'] = 15
-	
-	# If highlight_sites is provided, update marker colors and sizes
+	# Marker colors and sizes; locations with any site in highlight_sites
+	# are shown in cyan with size 20
+	marker_colors = grouped['color_rgba'].to_numpy()
+	marker_sizes = np.full(len(grouped), 15)
 	if highlight_sites is not None:
-		# update grouped['color_rgba'] and grouped['marker_size']	
-		# for each row check if any site in the list group['site_name'] is in highlight_sites
-		# if yes, set color to cyan and size to 20
-		masker = grouped['site_name'].apply(
-			lambda x: any(site in highlight_sites for site in x)
-		)
-		grouped.loc[masker, 'color_rgba'] = 'cyan'
-		grouped.loc[masker, 'marker_size'] = 20
+		masker = _highlighted_locations(sites_df, group_ids, len(grouped), highlight_sites)
+		marker_colors = np.where(masker, 'cyan', marker_colors)
+		marker_sizes = np.where(masker, 20, 15)
 
 	# Create the map figure
+	# plain dict trace and layout with _validate=False, as in create_ranking_chart
 	fig = go.Figure(
-		go.Scattermapbox(
-			lat=grouped['latitude'],
-			lon=grouped['longitude'],
+		data=[dict(
+			type='scattermapbox',
+			lat=grouped['latitude'].to_numpy(),
+			lon=grouped['longitude'].to_numpy(),
 			mode='markers',
 			marker=dict(
-				color=grouped['color_rgba'],
-				size=grouped['marker_size'],
+				color=marker_colors,
+				size=marker_sizes,
 				opacity=1
 			),
-			text=grouped['site_text'],
-			customdata=grouped['site_name'],  # Pass site name for clickData
+			text=site_text,
+			customdata=grouped['site_name'].tolist(),  # Pass site name for clickData
 			hoverinfo='text'
-		)
-	)
-
-	# Update layout for better appearance
-	fig.update_layout(
-		autosize=True,
-		mapbox=dict(
-			style='open-street-map',  # No token required for this style
-			center=dict(lat=map_center[0], lon=map_center[1]),
-			zoom=zoom
+		)],
+		layout=dict(
+			_MAP_LAYOUT,
+			mapbox=dict(
+				style='open-street-map',  # No token required for this style
+				center=dict(lat=map_center[0], lon=map_center[1]),
+				zoom=zoom
+			),
 		),
-		margin=dict(l=0, r=0, t=0, b=0),
-		height=400,
-		showlegend=False
+		_validate=False,
 	)
 
 	return fig
@@ -343,36 +428,53 @@ def create_oregon_map_folium(
 		zoom_start=zoom,
 		tiles='OpenStreetMap',
 		max_zoom=12,  # Set maximum zoom level for privacy
+		prefer_canvas=True,  # draw the circle markers on one canvas instead of an SVG node each
 		)
 	
-	# Add site markers
-	for (lat, lon), group in sites_df.groupby(['latitude', 'longitude']):
-		
-		# get color from the row with the highest main_col value within this group
-		color_ = group[group[main_col]==group[main_col].max()]['color_rgba'].values[0]
-		
-		# Determine edge color and width
-		edge_color_ = color_ # default edge color
-		edge_width_ = 1 # default edge width
-		# If highlight_sites is provided, check if any site in this group is in highlight_sites
-		if (highlight_sites is not None) and (highlight_sites[0] in group["site_name"].values):
-			edge_color_ = "cyan"
-			edge_width_ = 5
-
-		# Create tooltip string by joining site names with line breaks
-		tooltip_str = ""
-		for _, row in group.iterrows():
-			tooltip_str += f"{row['site_name']}<br>"
-
-		# Add CircleMarker to the map
-		folium.CircleMarker(
-			location=[lat, lon],
-			radius=7,
-			fillColor=color_,
-			color=edge_color_,
-			weight=edge_width_,
-			fillOpacity=1,
-			tooltip=tooltip_str
-		).add_to(m)
+	# One marker per location (same memoized grouping as create_oregon_map_plotly)
+	grouped, group_ids = _group_sites_by_location(sites_df, main_col)
+	# tooltip string with site names separated by line breaks
+	tooltips = ["<br>".join(map(str, names)) for names in grouped['site_name']]
+	fill_colors = grouped['color_rgba'].to_numpy()
+	# locations containing any highlighted site get a thick cyan edge
+	highlighted = _highlighted_locations(sites_df, group_ids, len(grouped), highlight_sites)
+	edge_colors = np.where(highlighted, "cyan", fill_colors)
+	edge_widths = np.where(highlighted, 5, 1)
+
+	# Collect one GeoJSON point feature per site location
+	features = [
+		{
+			"type": "Feature",
+			"geometry": {"type": "Point", "coordinates": [lon, lat]},
+			"properties": {
+				"tooltip": tooltip,
+				"fill_color": color_,
+				"edge_color": edge_color_,
+				"edge_width": edge_width_,
+			},
+		}
+		for lat, lon, tooltip, color_, edge_color_, edge_width_ in zip(
+			grouped['latitude'].tolist(),
+			grouped['longitude'].tolist(),
+			tooltips,
+			fill_colors.tolist(),
+			edge_colors.tolist(),
+			edge_widths.tolist(),
+		)
+	]
+
+	# Add all site markers as a single GeoJSON layer (one layer and one template render
+	# instead of a CircleMarker per location); styles are read from each feature's properties
+	folium.GeoJson(
+		{"type": "FeatureCollection", "features": features},
+		marker=folium.CircleMarker(radius=7, fill=True, fill_opacity=1),
+		style_function=lambda feature: {
+			"fillColor": feature["properties"]["fill_color"],
+			"color": feature["properties"]["edge_color"],
+			"weight": feature["properties"]["edge_width"],
+			"fillOpacity": 1,
+		},
+		tooltip=folium.GeoJsonTooltip(fields=["tooltip"], labels=False),
+	).add_to(m)
 
 	return m
\ No newline at end of file
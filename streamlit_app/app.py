@@ -8,6 +8,7 @@ Streamlit app for visualizing Oregon Dark Sky SQM data.
 # importing necessary libraries
 import sys
 from pathlib import Path
+import numpy as np
 import streamlit as st
 from streamlit_folium import st_folium
 
@@ -69,42 +70,43 @@ metric_text_dict = {
     in the night sky. Measurement at each site is averaged over all months of the year."""
 }
 
+# Templates of the additional site information per measurement type, filled from a data row
+add_text_template_dict = {
+"clear_nights_brightness": """
+            <br>{x_brighter_than_darkest_night_sky:.2f}-times brighter than the darkest Night Sky
+            <br>Bortle level: {bortle_sky_level}
+            <br>Median Night Sky Brightness: {median_brightness_mag_arcsec2:.2f} mag/arcsec²
+            <br>Flux Ratio: {median_linear_scale_flux_ratio:.2f}
+            """,
+"cloudy_nights_brightness": """
+            <br>{x_brighter_than_darkest_night_sky:.2f}-times brighter than the darkest Night Sky
+            <br>Median Night Sky Brightness: {median_brightness_mag_arcsec2:.2f} mag/arcsec²
+            <br>Flux Ratio: {median_linear_scale_flux_ratio:.2f}
+            """,
+"long_term_trends": """
+            <br>Rate of Change in Night Sky Brightness compared to a certified Dark Sky Park: {Rate_of_Change_vs_Prineville_Reservoir_State_Park:.1f}
+            <br>Trendline Slope: {Regression_Line_Slope_x_10000:.2f}
+            <br>Percentage Change in Night Sky Brightness per year: {Percent_Change_per_year:.1f}%
+            <br>Number of Years of Data: {Number_of_Years_of_Data:.1f}
+            """,
+"milky_way_visibility": """
+            <br>Ratio Index: {ratio_index:.2f}
+            <br>Difference Index: {difference_index_mag_arcsec2:.2f}
+            """,
+"% clear nights": """
+            <br>Percentage of Clear (no clouds) nights: {percent_clear_night_samples_all_months:.2f}%
+            """
+}
+
 def get_add_text_dict(row, meas_type):
     # Generate additional text information for each measurement type based on a data row
-    if meas_type == "clear_nights_brightness":
-        txt_ = f"""
-            <br>{row['x_brighter_than_darkest_night_sky']:.2f}-times brighter than the darkest Night Sky
-            <br>Bortle level: {row['bortle_sky_level']}
-            <br>Median Night Sky Brightness: {row['median_brightness_mag_arcsec2']:.2f} mag/arcsec²
-            <br>Flux Ratio: {row['median_linear_scale_flux_ratio']:.2f}
-            """
-    elif meas_type == "cloudy_nights_brightness":
-        txt_ = f"""
-            <br>{row['x_brighter_than_darkest_night_sky']:.2f}-times brighter than the darkest Night Sky
-            <br>Median Night Sky Brightness: {row['median_brightness_mag_arcsec2']:.2f} mag/arcsec²
-            <br>Flux Ratio: {row['median_linear_scale_flux_ratio']:.2f}
-            """
-    elif meas_type == "long_term_trends":
-        txt_ = f"""
-            <br>Rate of Change in Night Sky Brightness compared to a certified Dark Sky Park: {row['Rate_of_Change_vs_Prineville_Reservoir_State_Park']:.1f}
-            <br>Trendline Slope: {row['Regression_Line_Slope_x_10000']:.2f}
-            <br>Percentage Change in Night Sky Brightness per year: {row['Percent_Change_per_year']:.1f}%
-            <br>Number of Years of Data: {row['Number_of_Years_of_Data']}
-            """
-    elif meas_type == "milky_way_visibility":
-        txt_ = f"""
-            <br>Ratio Index: {row['ratio_index']:.2f}
-            <br>Difference Index: {row['difference_index_mag_arcsec2']:.2f}
-            """
-    elif meas_type == "% clear nights":
-        txt_ = f"""
-            <br>Percentage of Clear (no clouds) nights: {row['percent_clear_night_samples_all_months']:.2f}%
-            """
-    else:
-        txt_ = ""
-    return txt_
+    # (a single template lookup instead of an if/elif chain over measurement types)
+    template = add_text_template_dict.get(meas_type)
+    if template is None:
+        return ""
+    return template.format(**row)
 
-@st.cache_data(ttl=3600) # caching data loading for 1 hour
+@st.cache_resource(ttl=3600) # sharing one processor (and its raw-data cache) across reruns for 1 hour
 def load_data():
     """
     Load OregonSQMProcessor class to handle data loading and processing.
@@ -116,6 +118,54 @@ def load_data():
     """
     return OregonSQMProcessor(data_dir=project_root / "shared" / "data")
 
+@st.cache_data(ttl=3600) # caching processed data per measurement type for 1 hour (then rebuilt, re-reading changed raw files)
+def load_meas_type_data(meas_type):
+    """
+    Load processed data for a measurement type, so app reruns (e.g. clicks)
+    don't re-read and re-merge the CSV files.
+
+    Parameters
+    ----------
+    meas_type : str
+        The measurement type key.
+
+    Returns
+    -------
+    pd.DataFrame
+        Processed DataFrame for the measurement type.
+    """
+    meas_type_configs = get_meas_type_config(meas_type)
+    return load_data().load_processed_data(
+        data_key=meas_type_configs['data_key'],
+        bar_chart_col=meas_type_configs['bar_chart']['bar_chart_y_col']
+    )
+
+@st.cache_data(ttl=3600) # caching the sorted ranking data alongside the processed data
+def load_ranking_data(meas_type):
+    """
+    Load the ranking columns of the processed data for a measurement type,
+    pre-sorted by its ranking column, so the ranking chart doesn't re-sort it on every rerun.
+
+    Parameters
+    ----------
+    meas_type : str
+        The measurement type key.
+
+    Returns
+    -------
+    pd.DataFrame
+        Ranking column, site_name and color_rgba, sorted in ascending order of the ranking column.
+    """
+    meas_type_configs = get_meas_type_config(meas_type)
+    y_col = meas_type_configs['bar_chart']['bar_chart_y_col']
+    # load only the columns create_ranking_chart reads, so the join, dropna, the sort and
+    # the per-rerun copy handed out by st.cache_data move less data
+    return load_data().load_processed_data(
+        data_key=meas_type_configs['data_key'],
+        bar_chart_col=y_col,
+        columns=[y_col, 'site_name', 'color_rgba']
+    ).dropna(subset=[y_col, 'site_name']).sort_values(y_col)
+
 def main():
     """
     Main function to run the Streamlit app.
@@ -136,9 +186,6 @@ def main():
     if "clicked_sites" not in st.session_state.keys():
         st.session_state["clicked_sites"] = None
     
-    # Load data using the OregonSQMProcessor class
-    processor = load_data()
-
     # Custom CSS for top margin adjustment
     st.markdown(
         """
@@ -208,11 +255,8 @@ def main():
     st.markdown("<h6>Measurements explained:</h6> ", unsafe_allow_html=True)
     st.markdown(metric_text_dict[meas_type], unsafe_allow_html=True)
 
-    # load processed data based on the selected measurement type
-    final_data_df = processor.load_processed_data(
-        data_key=meas_type_configs['data_key'],
-        bar_chart_col=meas_type_configs['bar_chart']['bar_chart_y_col']
-    )
+    # load processed data based on the selected measurement type (cached across reruns)
+    final_data_df = load_meas_type_data(meas_type)
     
     # Layout: Two columns - Map + Scatter plot on left, Ranking chart on right
     col_left, col_middle, col_right = st.columns([0.4, 0.35, 0.25], gap="small")
@@ -265,14 +309,15 @@ def main():
             # Extract latitude and longitude
             lat, lng = clicked_obj.get("lat"), clicked_obj.get("lng")
             # Find the site in your DataFrame
-            site_row = final_data_df[
-                (abs(final_data_df["latitude"] - lat) < 1e-4) 
+            # (boolean mask on the raw arrays: no DataFrame slice is built just to test for a match)
+            site_mask = (
+                (np.abs(final_data_df["latitude"].to_numpy() - lat) < 1e-4)
                 &
-                (abs(final_data_df["longitude"] - lng) < 1e-4)
-            ]
+                (np.abs(final_data_df["longitude"].to_numpy() - lng) < 1e-4)
+            )
             # If a matching site is found, get its name
-            if not site_row.empty:
-                new_clicked = site_row["site_name"].values
+            if site_mask.any():
+                new_clicked = final_data_df["site_name"].to_numpy()[site_mask]
                 if not (
                     isinstance(st.session_state["clicked_sites"], type(new_clicked))
                     and
@@ -284,7 +329,8 @@ def main():
         # Display site information below the map
         if st.session_state.get("clicked_sites") is not None:      
             site_row = final_data_df[final_data_df["site_name"].isin(st.session_state["clicked_sites"])]
-            for i, row in site_row.iterrows():
+            # convert the selected rows to plain dicts in one pass instead of building a Series per row
+            for row in site_row.to_dict(orient="records"):
                 # Display site information first line
                 markdown_text = f"<p style='margin:0; padding:0;'><strong>{row['site_name']}</strong>"
                 # Special note for Dark Sky Certified/Qualified sites
@@ -312,7 +358,7 @@ def main():
         
         # creating ranking chart based on the selected measurement type
         fig_bar = create_ranking_chart(
-            sites_df=final_data_df,
+            sites_df=load_ranking_data(meas_type),
             configs=meas_type_configs['bar_chart'],
             clicked_sites=st.session_state["clicked_sites"],
         )
@@ -1,4 +1,6 @@
+import json
 import unittest
+from plotly.utils import PlotlyJSONEncoder
 
 class TestDashAppSmoke(unittest.TestCase):
     def test_app_import_and_create(self):
@@ -12,5 +14,95 @@ class TestDashAppSmoke(unittest.TestCase):
         except Exception as e:
             self.fail(f"Dash app failed to import or create: {e}")
 
+
+class TestDashboardSelectionUpdates(unittest.TestCase):
+    def setUp(self):
+        """
+        Set up a test client for the Dash server and the update_dashboard callback spec.
+        """
+        import dash_app.app
+        self.client = dash_app.app.app.server.test_client()
+        # callback_map key of update_dashboard, e.g. "..oregon-map.figure...site-info-div.children.."
+        self.output = next(
+            key for key in dash_app.app.app.callback_map if 'oregon-map.figure' in key
+        )
+        self.outputs = [
+            dict(zip(('id', 'property'), out_.rsplit('.', 1)))
+            for out_ in self.output.strip('.').split('...')
+        ]
+
+    def _update_dashboard(self, changed_prop_ids, meas_type, clicked_sites, refresh_clicks=None):
+        """
+        POST an update_dashboard request as the browser would and return the
+        response keyed by component id.
+        """
+        payload = {
+            'output': self.output,
+            'outputs': self.outputs,
+            'inputs': [
+                {'id': 'meas-type-radio', 'property': 'value', 'value': meas_type},
+                {'id': 'clicked-sites-store', 'property': 'data', 'value': clicked_sites},
+                {'id': 'refresh-btn', 'property': 'n_clicks', 'value': refresh_clicks},
+                {'id': 'max-zoom-violation-store', 'property': 'data', 'value': False},
+            ],
+            'state': [
+                {'id': 'map-zoom-store', 'property': 'data', 'value': 5},
+                {'id': 'map-center-store', 'property': 'data', 'value': [44.0, -121.0]},
+            ],
+            'changedPropIds': changed_prop_ids,
+        }
+        response = self.client.post('/_dash-update-component', json=payload)
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.data)['response']
+
+    def test_patches_on_selection_only(self):
+        """
+        Test that a selection-only update sends Patches for the map and the ranking
+        chart, while a measurement type change or a refresh sends the full figures.
+        """
+        from dash_app.app import _build_ranking_figure
+        clicked_sites = ['Hart Mountain', 'Antelope']
+        # only the clicked sites changed: a Patch of the marker colors/sizes and the map view
+        response = self._update_dashboard(
+            ['clicked-sites-store.data'], 'clear_nights_brightness', clicked_sites
+        )
+        map_patch = response['oregon-map']['figure']
+        self.assertIn('__dash_patch_update', map_patch)
+        self.assertEqual(
+            sorted(op['location'] for op in map_patch['operations']),
+            [
+                ['data', 0, 'marker', 'color'],
+                ['data', 0, 'marker', 'size'],
+                ['layout', 'mapbox', 'center'],
+                ['layout', 'mapbox', 'zoom'],
+            ]
+        )
+        # ...and a Patch of only the ranking bar borders, matching the full figure's borders
+        bar_patch = response['bar-chart']['figure']
+        self.assertIn('__dash_patch_update', bar_patch)
+        self.assertEqual(
+            [op['location'] for op in bar_patch['operations']], [['data', 0, 'marker', 'line']]
+        )
+        expected_line = _build_ranking_figure(
+            'clear_nights_brightness', tuple(sorted(clicked_sites))
+        )['data'][0]['marker']['line']
+        self.assertEqual(
+            bar_patch['operations'][0]['params']['value'],
+            json.loads(json.dumps(expected_line, cls=PlotlyJSONEncoder))
+        )
+        # measurement type change or refresh: the full figure
+        for changed_prop_ids, refresh_clicks in [
+            (['meas-type-radio.value'], None),
+            (['refresh-btn.n_clicks'], 1),
+        ]:
+            response = self._update_dashboard(
+                changed_prop_ids, 'clear_nights_brightness', clicked_sites, refresh_clicks
+            )
+            for full_figure in (response['oregon-map']['figure'], response['bar-chart']['figure']):
+                self.assertNotIn('__dash_patch_update', full_figure)
+                self.assertIn('data', full_figure)
+                self.assertIn('layout', full_figure)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -2,7 +2,11 @@
 Unit tests for shared.utils.data_processing.OregonSQMProcessor
 """
 # standard libraries
+import os
+import shutil
+import tempfile
 import unittest
+from unittest import mock
 import pandas as pd
 from pathlib import Path
 from shared.utils.data_processing import OregonSQMProcessor
@@ -143,6 +147,126 @@ class TestOregonSQMProcessor(unittest.TestCase):
                 )
 
 
+    def test_load_raw_data_thread_pool(self):
+        """
+        Test that loading the raw files on the thread pool (used above
+        THREADED_LOAD_MIN_BYTES) gives the same DataFrames as loading them in turn.
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            shutil.copytree(self.processor.raw_dir, Path(tmp_dir) / "raw")
+            with mock.patch('shared.utils.data_processing.THREADED_LOAD_MIN_BYTES', 0):
+                pooled_data = OregonSQMProcessor(data_dir=Path(tmp_dir)).load_raw_data()
+        sequential_data = self.processor.load_raw_data()
+        self.assertEqual(list(pooled_data), list(sequential_data))
+        for key, df in sequential_data.items():
+            pd.testing.assert_frame_equal(pooled_data[key], df)
+
+
+    def test_load_raw_data_pyarrow_engine(self):
+        """
+        Test that raw files parsed with the pyarrow engine (used from PYARROW_CSV_MIN_BYTES)
+        give the same DataFrames, dtypes included, as the default C parser.
+        """
+        read_csv = pd.read_csv
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            shutil.copytree(self.processor.raw_dir, Path(tmp_dir) / "raw")
+            # parse the CSV files themselves, not prebuilt Feather copies
+            for feather_copy in (Path(tmp_dir) / "raw").glob("*.feather"):
+                feather_copy.unlink()
+            processor = OregonSQMProcessor(data_dir=Path(tmp_dir))
+            with mock.patch('shared.utils.data_processing.PYARROW_CSV_MIN_BYTES', 0), \
+                    mock.patch.object(pd, 'read_csv', wraps=read_csv) as read_csv_spy:
+                pyarrow_data = processor.load_raw_data()
+            # every file went through the pyarrow engine
+            self.assertEqual(read_csv_spy.call_count, len(pyarrow_data))
+            for call in read_csv_spy.call_args_list:
+                self.assertEqual(call.kwargs.get('engine'), 'pyarrow')
+
+            for key, filename in processor._get_csv_file_map().items():
+                pd.testing.assert_frame_equal(
+                    pyarrow_data[key], read_csv(processor.raw_dir / filename)
+                )
+
+
+    def test_prebuild_cache(self):
+        """
+        Test that raw data loaded from the prebuilt Feather copies matches the CSV files.
+        """
+        # work on a temporary copy of the raw data directory
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            shutil.copytree(self.processor.raw_dir, Path(tmp_dir) / "raw")
+            cached_processor = OregonSQMProcessor(data_dir=Path(tmp_dir))
+            cached_processor.prebuild_cache()
+            
+            # Check that a Feather copy was written for every CSV file
+            for filename in cached_processor._get_csv_file_map().values():
+                self.assertTrue(
+                    (cached_processor.raw_dir / filename).with_suffix('.feather').exists(),
+                    f"Missing Feather copy of {filename}"
+                )
+            
+            # Check that the DataFrames are identical to the ones read from CSV
+            csv_data = self.processor.load_raw_data()
+            cached_data = cached_processor.load_raw_data()
+            for key, csv_df in csv_data.items():
+                pd.testing.assert_frame_equal(cached_data[key], csv_df)
+
+
+    def test_load_raw_data_feather_fallback(self):
+        """
+        Test that loading never writes Feather copies, and that an unreadable
+        Feather copy falls back to the CSV file.
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            shutil.copytree(self.processor.raw_dir, Path(tmp_dir) / "raw")
+            raw_dir = Path(tmp_dir) / "raw"
+            for stale_copy in raw_dir.glob("*.feather"):
+                stale_copy.unlink()
+            # corrupt Feather copy of one table, newer than its CSV
+            filename = self.processor._get_csv_file_map()['geocode']
+            (raw_dir / filename).with_suffix('.feather').write_bytes(b"not a feather file")
+
+            raw_data = OregonSQMProcessor(data_dir=Path(tmp_dir)).load_raw_data()
+
+            pd.testing.assert_frame_equal(raw_data['geocode'], pd.read_csv(raw_dir / filename))
+            # only the corrupt copy exists; no other Feather or temporary files were written
+            self.assertEqual(
+                sorted(p.name for p in raw_dir.glob("*.feather*")),
+                [Path(filename).with_suffix('.feather').name]
+            )
+
+
+    def test_load_raw_data_reloads_changed_files(self):
+        """
+        Test that cached raw tables are reused until their file changes on disk,
+        and that processed data is then built from the new file.
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            shutil.copytree(self.processor.raw_dir, Path(tmp_dir) / "raw")
+            for stale_copy in (Path(tmp_dir) / "raw").glob("*.feather"):
+                stale_copy.unlink()
+            processor = OregonSQMProcessor(data_dir=Path(tmp_dir))
+            first = processor.load_raw_data()
+            self.assertIs(processor.load_raw_data()['geocode'], first['geocode'])
+
+            # rewrite the geocode file without its first site, with a newer modification time
+            geocode_path = processor.raw_dir / processor._get_csv_file_map()['geocode']
+            first['geocode'].iloc[1:].to_csv(geocode_path, index=False)
+            mtime = geocode_path.stat().st_mtime + 10
+            os.utime(geocode_path, (mtime, mtime))
+
+            second = processor.load_raw_data()
+            pd.testing.assert_frame_equal(second['geocode'], pd.read_csv(geocode_path))
+            self.assertIs(second['clear_measurements'], first['clear_measurements'])
+            processed_df = processor.load_processed_data(
+                data_key='clear_measurements', bar_chart_col='median_brightness_mag_arcsec2'
+            )
+            dropped_site = first['geocode']['site_name'].iloc[0]
+            dropped_rows = processed_df[processed_df['site_name'] == dropped_site]
+            self.assertFalse(dropped_rows.empty)
+            self.assertTrue(dropped_rows['latitude'].isna().all())
+
+
     def test_load_processed_data(self):
         """
         Test loading and processing of data for a specific measurement type.
@@ -236,6 +360,64 @@ class TestOregonSQMProcessor(unittest.TestCase):
                     self.assertTrue(pd.api.types.is_string_dtype(processed_df[col]))
                     self.assertFalse(processed_df[col].isnull().any())               
 
+
+    def test_load_processed_data_columns(self):
+        """
+        Test that load_processed_data returns only the requested columns, with the same values.
+        """
+        full_df = self.processor.load_processed_data(
+            data_key='clear_measurements',
+            bar_chart_col='x_brighter_than_darkest_night_sky'
+        )
+        for columns in [
+            ['site_name', 'x_brighter_than_darkest_night_sky', 'color_rgba'],
+            ['site_name', 'latitude', 'longitude', 'DarkSkyCertified'],
+            ['median_brightness_mag_arcsec2'],
+        ]:
+            subset_df = self.processor.load_processed_data(
+                data_key='clear_measurements',
+                bar_chart_col='x_brighter_than_darkest_night_sky',
+                columns=columns
+            )
+            # Check that only the requested columns are returned, in order
+            self.assertListEqual(list(subset_df.columns), columns)
+            # Check that the values match the full processed DataFrame
+            pd.testing.assert_frame_equal(subset_df, full_df[columns])
+
+
+    def test_downcast_numeric_columns_precision(self):
+        """
+        Test that processed numeric columns are downcast without losing display precision.
+        """
+        raw_dfs = self.processor.load_raw_data()
+        key_value_cols = {
+            'clear_measurements': 'median_brightness_mag_arcsec2',
+            'cloudy_measurements': 'median_brightness_mag_arcsec2',
+            'trends': 'Rate_of_Change_vs_Prineville_Reservoir_State_Park',
+            'milky_way': 'ratio_index',
+            'cloud_coverage': 'percent_clear_night_samples_all_months',
+        }
+        for key, value_col in key_value_cols.items():
+            processed_df = self.processor.load_processed_data(
+                data_key=key,
+                bar_chart_col=value_col
+            )
+            raw_df = raw_dfs[key]
+            for col in raw_df.columns:
+                if pd.api.types.is_float_dtype(raw_df[col]):
+                    # float columns are stored as float32 and stay within 1e-3 of the raw values
+                    self.assertEqual(processed_df[col].dtype, 'float32', f"{col} in {key}")
+                    max_abs_diff = (
+                        processed_df[col].astype('float64') - raw_df[col]
+                    ).abs().max()
+                    self.assertLess(max_abs_diff, 1e-3, f"Precision lost for {col} in {key}")
+                elif pd.api.types.is_integer_dtype(raw_df[col]):
+                    # integer columns (e.g. Bortle level) keep their exact values
+                    self.assertTrue(
+                        (processed_df[col].astype('int64') == raw_df[col]).all(),
+                        f"Values changed for {col} in {key}"
+                    )
+
 if __name__ == "__main__":
     # Run the tests via command line
     unittest.main()
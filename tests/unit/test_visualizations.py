@@ -4,6 +4,7 @@ Unit tests for shared.utils.visualizations
 import unittest
 
 import folium
+import numpy as np
 import plotly.graph_objects as go
 from shared.utils.visualizations import (
     create_oregon_map_folium, 
@@ -91,7 +92,40 @@ class TestVisualizations(unittest.TestCase):
         # Check that the map has data
         self.assertGreater(len(fig.data), 0)
 
-    
+    def test_map_highlight_with_array_selection(self):
+        """
+        Test that both map builders accept a multi-element numpy array of
+        clicked sites, as stored by the Streamlit app for a shared location.
+        """
+        # SiteC shares SiteA's coordinates, so one marker covers both
+        df = pd.concat([self.df, pd.DataFrame({
+            "site_name": ["SiteC"],
+            "median_brightness_mag_arcsec2": [21.0],
+            "x_brighter_than_darkest_night_sky": [3.0],
+            "latitude": [44.0],
+            "longitude": [-123.0],
+            "color_rgba": ["rgba(0, 100, 100, 1)"]
+        })], ignore_index=True)
+        clicked_sites = np.array(["SiteA", "SiteC"])
+
+        # plotly map: the shared location is highlighted in cyan
+        fig = create_oregon_map_plotly(
+            sites_df=df,
+            color_col=self.sample_configs['scatter_x_col'],
+            highlight_sites=clicked_sites
+        )
+        self.assertEqual(list(fig.data[0].marker.color), ["cyan", "rgba(255, 0, 0, 1)"])
+
+        # folium map: the shared location gets the cyan edge
+        fmap = create_oregon_map_folium(
+            sites_df=df,
+            main_col=self.sample_configs['bar_chart_y_col'],
+            highlight_sites=clicked_sites
+        )
+        geojson = [c for c in fmap._children.values() if isinstance(c, folium.GeoJson)][0]
+        edge_colors = [f["properties"]["edge_color"] for f in geojson.data["features"]]
+        self.assertEqual(edge_colors, ["cyan", "rgba(255, 0, 0, 1)"])
+
     def test_create_ranking_chart(self):
         """
         Test the creation of a ranking chart with plotly."""